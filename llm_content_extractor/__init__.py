@@ -1,6 +1,6 @@
 """LLM Content Extractor - A robust content extractor for LLM outputs."""
 
-from llm_content_extractor.extractor import extract, ContentType
+from llm_content_extractor.extractor import extract, extract_batch, ContentType
 from llm_content_extractor.strategies import (
     JSONExtractor,
     XMLExtractor,
@@ -11,6 +11,7 @@ from llm_content_extractor.strategies import (
 __version__ = "0.1.0"
 __all__ = [
     "extract",
+    "extract_batch",
     "ContentType",
     "JSONExtractor",
     "XMLExtractor",
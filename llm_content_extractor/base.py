@@ -34,25 +34,47 @@ class ContentExtractor(ABC):
         Returns:
             Text with fences removed
         """
-        text = text.strip()
+        # Track the slice bounds and cut the string once at the end
+        end = len(text.rstrip())
+        start = self._skip_whitespace(text, 0, end)
 
         # Try to find code block with specified language
         if language:
             markers = [f"```{language}", f"```{language.upper()}"]
             for marker in markers:
-                if text.startswith(marker):
-                    text = text[len(marker):].lstrip()
+                if text.startswith(marker, start, end):
+                    start = self._skip_whitespace(text, start + len(marker), end)
                     break
 
         # Remove generic code fence
-        if text.startswith("```"):
+        if text.startswith("```", start, end):
             # Find the end of the first line (language identifier)
-            newline_idx = text.find("\n")
+            newline_idx = text.find("\n", start, end)
             if newline_idx != -1:
-                text = text[newline_idx + 1:]
+                start = newline_idx + 1
 
         # Remove trailing fence
-        if text.endswith("```"):
-            text = text[:-3].rstrip()
+        if text.endswith("```", start, end):
+            end -= 3
+            while end > start and text[end - 1].isspace():
+                end -= 1
 
-        return text.strip()
+        start = self._skip_whitespace(text, start, end)
+        return text[start:end]
+
+    @staticmethod
+    def _skip_whitespace(text: str, pos: int, end: int) -> int:
+        """
+        Advance past whitespace without allocating a stripped copy.
+
+        Args:
+            text: Text to scan
+            pos: Start position
+            end: Position to stop at
+
+        Returns:
+            Position of the first non-whitespace character, or end
+        """
+        while pos < end and text[pos].isspace():
+            pos += 1
+        return pos
@@ -1,7 +1,8 @@
 """Main API interface for content extraction."""
 
+import functools
 from enum import Enum
-from typing import Any, Union
+from typing import Any, Iterable, List, Optional, Union
 
 from llm_content_extractor.base import ContentExtractor
 from llm_content_extractor.strategies import (
@@ -21,6 +22,9 @@ class ContentType(Enum):
     CODE = "code"
 
 
+# Lookup table for string content types
+_STR_TO_CONTENT_TYPE = {ct.value: ct for ct in ContentType}
+
 # Registry of extractors
 _EXTRACTORS = {
     ContentType.JSON: JSONExtractor,
@@ -34,7 +38,7 @@ def extract(
     raw_text: str,
     content_type: Union[ContentType, str],
     language: str = "",
-    extractor: ContentExtractor = None,
+    extractor: Optional[ContentExtractor] = None,
 ) -> Union[str, Any]:
     """
     Extract and parse content from LLM output.
@@ -70,35 +74,115 @@ def extract(
         >>> custom = JSONExtractor()
         >>> result = extract(raw_text, ContentType.JSON, extractor=custom)
     """
+    return _resolve_extractor(content_type, language, extractor).extract(raw_text)
+
+
+def extract_batch(
+    raw_texts: Iterable[str],
+    content_type: Union[ContentType, str],
+    language: str = "",
+    extractor: Optional[ContentExtractor] = None,
+) -> List[Union[str, Any]]:
+    """
+    Extract and parse content from many LLM outputs.
+
+    Equivalent to calling extract() on each text, but the content type and
+    extractor are resolved only once for the whole batch.
+
+    Args:
+        raw_texts: Raw string outputs from LLM
+        content_type: Type of content to extract (JSON, XML, HTML, CODE)
+        language: For CODE type, specify the language (e.g., 'python', 'javascript')
+        extractor: Optional custom extractor instance. If provided, content_type is ignored.
+
+    Returns:
+        List of extracted results, in the same order as raw_texts
+
+    Raises:
+        ValueError: If content cannot be extracted from any text or invalid content_type
+        TypeError: If invalid extractor provided
+
+    Example:
+        >>> results = extract_batch(['{"a": 1}', '```json\n[1, 2]\n```'], ContentType.JSON)
+        >>> print(results)  # [{'a': 1}, [1, 2]]
+    """
+    extract_one = _resolve_extractor(content_type, language, extractor).extract
+    return [extract_one(raw_text) for raw_text in raw_texts]
+
+
+def _resolve_extractor(
+    content_type: Union[ContentType, str],
+    language: str = "",
+    extractor: Optional[ContentExtractor] = None,
+) -> ContentExtractor:
+    """
+    Resolve the extractor to use for a content type.
+
+    Args:
+        content_type: Type of content to extract
+        language: For CODE type, the language to extract
+        extractor: Optional custom extractor instance, returned as-is
+
+    Returns:
+        Extractor instance
+
+    Raises:
+        ValueError: If invalid content_type
+        TypeError: If invalid extractor provided
+    """
     # If custom extractor provided, use it directly
     if extractor is not None:
         if not isinstance(extractor, ContentExtractor):
             raise TypeError("extractor must be an instance of ContentExtractor")
-        return extractor.extract(raw_text)
+        return extractor
 
     # Convert string to enum if needed
     if isinstance(content_type, str):
-        try:
-            content_type = ContentType(content_type.lower())
-        except ValueError:
-            valid_types = ", ".join([ct.value for ct in ContentType])
+        resolved = _STR_TO_CONTENT_TYPE.get(content_type.lower())
+        if resolved is None:
+            valid_types = ", ".join(_STR_TO_CONTENT_TYPE)
             raise ValueError(
                 f"Invalid content_type: {content_type}. Valid types: {valid_types}"
             )
+        content_type = resolved
+
+    # Language only applies to code; keep it out of the cache key otherwise
+    if content_type != ContentType.CODE:
+        language = ""
+
+    return _get_extractor(content_type, language)
 
+
+@functools.lru_cache(maxsize=32)
+def _get_extractor(content_type: ContentType, language: str = "") -> ContentExtractor:
+    """
+    Get a shared extractor instance for a content type.
+
+    Extractors only hold configuration, so one instance per
+    (content_type, language) is reused across calls.
+
+    Args:
+        content_type: Content type to extract
+        language: For CODE type, the language to extract
+
+    Returns:
+        Extractor instance
+
+    Raises:
+        ValueError: If no extractor is registered for the content type
+    """
     # Get the appropriate extractor class
     extractor_class = _EXTRACTORS.get(content_type)
     if extractor_class is None:
         raise ValueError(f"No extractor available for content_type: {content_type}")
 
     # Create extractor instance
+    extractor: ContentExtractor
     if content_type == ContentType.CODE and language:
-        extractor_instance = extractor_class(language=language)
+        extractor = extractor_class(language=language)
     else:
-        extractor_instance = extractor_class()
-
-    # Extract content
-    return extractor_instance.extract(raw_text)
+        extractor = extractor_class()
+    return extractor
 
 
 def register_extractor(content_type: ContentType, extractor_class: type) -> None:
@@ -106,6 +190,8 @@ def register_extractor(content_type: ContentType, extractor_class: type) -> None
     Register a custom extractor for a content type.
 
     This allows users to override default extractors or add support for new types.
+    The extractor is instantiated once and reused by extract(), so it should not
+    keep state between calls.
 
     Args:
         content_type: The content type this extractor handles
@@ -125,3 +211,4 @@ def register_extractor(content_type: ContentType, extractor_class: type) -> None
         raise TypeError("extractor_class must be a subclass of ContentExtractor")
 
     _EXTRACTORS[content_type] = extractor_class
+    _get_extractor.cache_clear()
@@ -1,10 +1,191 @@
 """Code block extraction strategy with robust error handling."""
 
+import functools
 import re
-from typing import Dict, List, Optional, Set
+from collections import Counter
+from typing import Dict, FrozenSet, Iterator, List, Optional, Set, Tuple
 
 from llm_content_extractor.base import ContentExtractor
 
+# Runs of word characters; keywords made only of word characters are counted
+# by looking them up among these tokens instead of searching for each one
+_WORD_RE = re.compile(r"\w+")
+
+# Every fenced code block, capturing the language identifier and the code
+_ALL_FENCES_RE = re.compile(r"```([\w+-]*)\s*\n(.*?)```", re.DOTALL)
+
+# Score at which _looks_like_code treats text as code
+_CODE_SCORE_THRESHOLD = 3
+
+# Code indicator categories as (name, pattern) pairs. Each category is searched
+# as one alternation (see _count_matching_patterns) behind a lookahead for the
+# characters its patterns can start with, which lets the regex engine skip
+# ahead the way it does for a single pattern.
+
+# Common code symbols (weight: 1 point each)
+_CODE_SYMBOL_LEAD = r"(?=[{}\[\]();=<>!+\-*/:])"
+_CODE_SYMBOL_PATTERNS = (
+    ("brace", r"[{}\[\]();]"),  # Braces, brackets, parentheses
+    ("cmp", r"[=<>!]="),  # Comparison operators
+    ("cmpd", r"[+\-*/]="),  # Compound assignment
+    ("arrow", r"=>"),  # Arrow function
+    ("ptr", r"->"),  # Pointer/arrow
+    ("scope", r"::"),  # Scope resolution
+)
+
+# Keywords (weight: 2 points each)
+_CODE_KEYWORD_LEAD = r"\b(?=[acdefilrsvwy])"
+_CODE_KEYWORD_PATTERNS = (
+    ("decl", r"(?:def|class|function|const|let|var)\s+\w+"),
+    ("module", r"(?:import|from|export|require)\s+"),
+    ("branch", r"(?:if|else|elif|for|while|switch|case)\s*\("),
+    ("flow", r"(?:return|yield|await|async)\s+"),
+)
+
+# Comments (weight: 1 point each) as (marker, pattern) pairs; a pattern is only
+# searched when its marker occurs in the text. Separate line-anchored searches
+# are faster here than an alternation.
+_CODE_COMMENT_RES = [
+    ("#", re.compile(r"^\s*#.*$", re.MULTILINE)),  # Python, Ruby, etc.
+    ("//", re.compile(r"^\s*//.*$", re.MULTILINE)),  # C-style
+    ("/*", re.compile(r"/\*.*?\*/", re.MULTILINE)),  # Multi-line C-style
+]
+
+# Start of a line indented by four spaces or a tab (indentation: 1 point)
+_INDENTED_LINE_RE = re.compile(r"^(?: {4}|\t)", re.MULTILINE)
+
+
+@functools.lru_cache(maxsize=None)
+def _alternation_re(lead: str, patterns: Tuple[Tuple[str, str], ...]) -> "re.Pattern[str]":
+    """
+    Compile (name, pattern) pairs into one alternation of named groups.
+
+    Args:
+        lead: Prefix shared by every alternative
+        patterns: Pattern names and regular expressions
+
+    Returns:
+        Compiled pattern whose lastgroup names the alternative that matched
+    """
+    alternation = "|".join(f"(?P<{name}>{pattern})" for name, pattern in patterns)
+    return re.compile(f"{lead}(?:{alternation})")
+
+
+def _count_matching_patterns(
+    lead: str, patterns: Tuple[Tuple[str, str], ...], text: str, limit: int
+) -> int:
+    """
+    Count how many of the patterns match somewhere in text.
+
+    The remaining patterns are searched together as one alternation. After
+    each hit the matched pattern is dropped and the search resumes at the
+    same position, so the text is scanned about once instead of once per
+    pattern.
+
+    Args:
+        lead: Prefix shared by every alternative
+        patterns: Pattern names and regular expressions
+        text: Text to search
+        limit: Stop counting once this many patterns have matched
+
+    Returns:
+        Number of patterns that match, capped at limit
+    """
+    found = 0
+    pos = 0
+    while patterns and found < limit:
+        match = _alternation_re(lead, patterns).search(text, pos)
+        if match is None:
+            break
+        found += 1
+        patterns = tuple(item for item in patterns if item[0] != match.lastgroup)
+        pos = match.start()
+    return found
+
+
+@functools.lru_cache(maxsize=None)
+def _keyword_re(keyword: str) -> "re.Pattern[str]":
+    """
+    Get the compiled whole-word pattern for a language keyword.
+
+    Args:
+        keyword: Language keyword
+
+    Returns:
+        Compiled pattern matching the keyword on word boundaries
+    """
+    return re.compile(rf"\b{re.escape(keyword)}\b")
+
+
+@functools.lru_cache(maxsize=32)
+def _keyword_languages(
+    language_keywords: Tuple[Tuple[str, FrozenSet[str]], ...]
+) -> Tuple[Dict[str, Tuple[str, ...]], Dict[str, Tuple[str, ...]]]:
+    """
+    Build the reverse mapping from each keyword to the languages that use it.
+
+    Args:
+        language_keywords: (language, keywords) pairs
+
+    Returns:
+        Tuple of mappings for word keywords (looked up among tokens) and
+        symbolic keywords such as '=>' (searched with a regex)
+    """
+    word_languages: Dict[str, List[str]] = {}
+    symbol_languages: Dict[str, List[str]] = {}
+    for language, keywords in language_keywords:
+        for keyword in keywords:
+            target = word_languages if keyword.isidentifier() else symbol_languages
+            target.setdefault(keyword, []).append(language)
+
+    return (
+        {keyword: tuple(languages) for keyword, languages in word_languages.items()},
+        {keyword: tuple(languages) for keyword, languages in symbol_languages.items()},
+    )
+
+
+@functools.lru_cache(maxsize=256)
+def _detect_language(
+    code: str, language_keywords: Tuple[Tuple[str, FrozenSet[str]], ...]
+) -> Optional[str]:
+    """
+    Detect the programming language of code by counting keywords.
+
+    Results are cached, so detecting the same snippet again is a lookup.
+
+    Args:
+        code: Code string to analyze
+        language_keywords: (language, keywords) pairs to score against
+
+    Returns:
+        Detected language name or None if uncertain
+    """
+    word_languages, symbol_languages = _keyword_languages(language_keywords)
+    language_scores: Dict[str, int] = {}
+
+    # Count keyword matches for each language from a single tokenization
+    for word, count in Counter(_WORD_RE.findall(code)).items():
+        for language in word_languages.get(word, ()):
+            language_scores[language] = language_scores.get(language, 0) + count
+
+    for keyword, languages in symbol_languages.items():
+        count = len(_keyword_re(keyword).findall(code))
+        if count:
+            for language in languages:
+                language_scores[language] = language_scores.get(language, 0) + count
+
+    if not language_scores:
+        return None
+
+    # Return language with highest score; ties go to the language listed first
+    detected = max(
+        ((language, language_scores.get(language, 0)) for language, _ in language_keywords),
+        key=lambda x: x[1],
+    )
+
+    # Only return if score is meaningful (at least 2 keywords)
+    return detected[0] if detected[1] >= 2 else None
+
 
 class CodeBlockExtractor(ContentExtractor):
     """
@@ -18,112 +199,124 @@ class CodeBlockExtractor(ContentExtractor):
 
     # Common programming language keywords for detection
     LANGUAGE_KEYWORDS = {
-        "python": {
-            "def",
-            "class",
-            "import",
-            "from",
-            "return",
-            "if",
-            "elif",
-            "else",
-            "for",
-            "while",
-            "try",
-            "except",
-            "with",
-            "lambda",
-            "yield",
-            "async",
-            "await",
-        },
-        "javascript": {
-            "function",
-            "const",
-            "let",
-            "var",
-            "return",
-            "if",
-            "else",
-            "for",
-            "while",
-            "class",
-            "import",
-            "export",
-            "async",
-            "await",
-            "=>",
-        },
-        "java": {
-            "public",
-            "private",
-            "protected",
-            "class",
-            "interface",
-            "void",
-            "int",
-            "String",
-            "return",
-            "if",
-            "else",
-            "for",
-            "while",
-            "try",
-            "catch",
-        },
-        "go": {
-            "func",
-            "package",
-            "import",
-            "var",
-            "const",
-            "type",
-            "struct",
-            "interface",
-            "return",
-            "if",
-            "else",
-            "for",
-            "range",
-            "defer",
-            "go",
-        },
-        "rust": {
-            "fn",
-            "let",
-            "mut",
-            "pub",
-            "struct",
-            "enum",
-            "impl",
-            "trait",
-            "use",
-            "mod",
-            "return",
-            "if",
-            "else",
-            "for",
-            "while",
-            "match",
-        },
-        "typescript": {
-            "function",
-            "const",
-            "let",
-            "var",
-            "interface",
-            "type",
-            "class",
-            "return",
-            "if",
-            "else",
-            "for",
-            "while",
-            "import",
-            "export",
-            "async",
-            "await",
-        },
+        "python": frozenset(
+            {
+                "def",
+                "class",
+                "import",
+                "from",
+                "return",
+                "if",
+                "elif",
+                "else",
+                "for",
+                "while",
+                "try",
+                "except",
+                "with",
+                "lambda",
+                "yield",
+                "async",
+                "await",
+            }
+        ),
+        "javascript": frozenset(
+            {
+                "function",
+                "const",
+                "let",
+                "var",
+                "return",
+                "if",
+                "else",
+                "for",
+                "while",
+                "class",
+                "import",
+                "export",
+                "async",
+                "await",
+                "=>",
+            }
+        ),
+        "java": frozenset(
+            {
+                "public",
+                "private",
+                "protected",
+                "class",
+                "interface",
+                "void",
+                "int",
+                "String",
+                "return",
+                "if",
+                "else",
+                "for",
+                "while",
+                "try",
+                "catch",
+            }
+        ),
+        "go": frozenset(
+            {
+                "func",
+                "package",
+                "import",
+                "var",
+                "const",
+                "type",
+                "struct",
+                "interface",
+                "return",
+                "if",
+                "else",
+                "for",
+                "range",
+                "defer",
+                "go",
+            }
+        ),
+        "rust": frozenset(
+            {
+                "fn",
+                "let",
+                "mut",
+                "pub",
+                "struct",
+                "enum",
+                "impl",
+                "trait",
+                "use",
+                "mod",
+                "return",
+                "if",
+                "else",
+                "for",
+                "while",
+                "match",
+            }
+        ),
+        "typescript": frozenset(
+            {
+                "function",
+                "const",
+                "let",
+                "var",
+                "interface",
+                "type",
+                "class",
+                "return",
+                "if",
+                "else",
+                "for",
+                "while",
+                "import",
+                "export",
+                "async",
+                "await",
+            }
+        ),
     }
 
     def __init__(self, language: str = "", strict: bool = False) -> None:
@@ -166,10 +359,11 @@ class CodeBlockExtractor(ContentExtractor):
 
         text = raw_text.strip()
 
-        # Strategy 1: Try to extract fenced code
-        code = self._extract_fenced_code(text)
-        if code:
-            return code
+        # Strategy 1: Try to extract fenced code (only possible with a fence marker)
+        if "```" in text:
+            code = self._extract_fenced_code(text)
+            if code:
+                return code
 
         # Strategy 2: If not strict mode, try to detect unfenced code
         if not self.strict:
@@ -216,18 +410,10 @@ class CodeBlockExtractor(ContentExtractor):
         Returns:
             Extracted code or empty string
         """
-        # Try exact match (case-insensitive)
-        patterns = [
-            rf"```{re.escape(language)}\s*\n(.*?)```",
-            rf"```{re.escape(language.upper())}\s*\n(.*?)```",
-            rf"```{re.escape(language.capitalize())}\s*\n(.*?)```",
-        ]
-
-        for pattern in patterns:
-            matches = re.findall(pattern, text, re.DOTALL | re.IGNORECASE)
-            if matches:
-                # Return the first match
-                return matches[0].strip()
+        # Exact match of the language identifier (case-insensitive)
+        code = self._scan_fence(text, language)
+        if code is not None:
+            return code.strip()
 
         return ""
 
@@ -241,22 +427,83 @@ class CodeBlockExtractor(ContentExtractor):
         Returns:
             Extracted code or empty string
         """
-        # Pattern for any fenced code block
-        pattern = r"```(?:\w+)?\s*\n(.*?)```"
-        matches = re.findall(pattern, text, re.DOTALL)
-
-        if matches:
-            # Return the first match
-            return matches[0].strip()
+        # Any fenced code block
+        code = self._scan_fence(text)
+        if code is not None:
+            return code.strip()
 
         # Try without newline after opening fence
-        pattern = r"```(?:\w+)?(.*?)```"
-        matches = re.findall(pattern, text, re.DOTALL)
+        start = text.find("```")
+        if start == -1:
+            return ""
 
-        if matches:
-            return matches[0].strip()
+        start = self._skip_word_chars(text, start + 3)
+        end = text.find("```", start)
+        if end == -1:
+            return ""
 
-        return ""
+        return text[start:end].strip()
+
+    def _scan_fence(self, text: str, language: str = "") -> Optional[str]:
+        """
+        Find the first fenced code block using a forward scan.
+
+        Walks the text with str.find instead of a lazy DOTALL regex, so the
+        scan is linear even when a fence is never closed.
+
+        An opening fence is ``` followed by the language identifier (or any
+        word characters if no language is given), optional whitespace and a
+        newline. The block ends at the next ```.
+
+        Args:
+            text: Text to search
+            language: Required language identifier (case-insensitive).
+                     Empty string accepts any identifier.
+
+        Returns:
+            Raw block content (unstripped), or None if no block is found
+        """
+        language = language.lower()
+        fence = text.find("```")
+
+        while fence != -1:
+            start = fence + 3
+            if language:
+                end = start + len(language)
+                matched = text[start:end].lower() == language
+                start = end
+            else:
+                start = self._skip_word_chars(text, start)
+                matched = True
+
+            if matched:
+                newline = text.find("\n", start)
+                if newline != -1 and (newline == start or text[start:newline].isspace()):
+                    close = text.find("```", newline + 1)
+                    if close == -1:
+                        # No later fence can be closed either
+                        return None
+                    return text[newline + 1:close]
+
+            fence = text.find("```", fence + 1)
+
+        return None
+
+    def _skip_word_chars(self, text: str, pos: int) -> int:
+        """
+        Advance past a run of word characters (a fence language identifier).
+
+        Args:
+            text: Text to scan
+            pos: Start position
+
+        Returns:
+            Position of the first non-word character at or after pos
+        """
+        length = len(text)
+        while pos < length and (text[pos].isalnum() or text[pos] == "_"):
+            pos += 1
+        return pos
 
     def _looks_like_code(self, text: str) -> bool:
         """
@@ -282,54 +529,40 @@ class CodeBlockExtractor(ContentExtractor):
             if self._contains_language_keywords(text, self.language):
                 return True
 
-        # General code indicators
+        # General code indicators; stop scanning once the threshold is reached
         code_score = 0
 
         # Check for common code symbols (weight: 1 point each)
-        code_symbols = [
-            r"[{}\[\]();]",  # Braces, brackets, parentheses
-            r"[=<>!]=",  # Comparison operators
-            r"[+\-*/]=",  # Compound assignment
-            r"=>",  # Arrow function
-            r"->",  # Pointer/arrow
-            r"::",  # Scope resolution
-        ]
-
-        for pattern in code_symbols:
-            if re.search(pattern, text):
-                code_score += 1
+        code_score += _count_matching_patterns(
+            _CODE_SYMBOL_LEAD, _CODE_SYMBOL_PATTERNS, text, _CODE_SCORE_THRESHOLD
+        )
+        if code_score >= _CODE_SCORE_THRESHOLD:
+            return True
 
         # Check for keywords (weight: 2 points)
-        keyword_patterns = [
-            r"\b(?:def|class|function|const|let|var)\s+\w+",
-            r"\b(?:import|from|export|require)\s+",
-            r"\b(?:if|else|elif|for|while|switch|case)\s*\(",
-            r"\b(?:return|yield|await|async)\s+",
-        ]
-
-        for pattern in keyword_patterns:
-            if re.search(pattern, text):
-                code_score += 2
+        code_score += 2 * _count_matching_patterns(
+            _CODE_KEYWORD_LEAD,
+            _CODE_KEYWORD_PATTERNS,
+            text,
+            (_CODE_SCORE_THRESHOLD - code_score + 1) // 2,
+        )
+        if code_score >= _CODE_SCORE_THRESHOLD:
+            return True
 
         # Check for comments (weight: 1 point)
-        comment_patterns = [
-            r"^\s*#.*$",  # Python, Ruby, etc.
-            r"^\s*//.*$",  # C-style
-            r"/\*.*?\*/",  # Multi-line C-style
-        ]
-
-        for pattern in comment_patterns:
-            if re.search(pattern, text, re.MULTILINE):
+        for marker, pattern in _CODE_COMMENT_RES:
+            if marker in text and pattern.search(text):
                 code_score += 1
+                if code_score >= _CODE_SCORE_THRESHOLD:
+                    return True
 
         # Check for indentation (weight: 1 point)
-        lines = text.split("\n")
-        indented_lines = sum(1 for line in lines if line.startswith(("    ", "\t")))
-        if indented_lines >= len(lines) * 0.3:  # 30% of lines are indented
+        total_lines = text.count("\n") + 1
+        indented_lines = len(_INDENTED_LINE_RE.findall(text))
+        if indented_lines * 10 >= total_lines * 3:  # 30% of lines are indented
             code_score += 1
 
-        # Threshold: score >= 3 suggests code
-        return code_score >= 3
+        return code_score >= _CODE_SCORE_THRESHOLD
 
     def _contains_language_keywords(self, text: str, language: str) -> bool:
         """
@@ -346,19 +579,26 @@ class CodeBlockExtractor(ContentExtractor):
             return False
 
         keywords = self.LANGUAGE_KEYWORDS[language]
+        words = set(_WORD_RE.findall(text))
         keyword_count = 0
 
         for keyword in keywords:
-            # Use word boundary for exact matches
-            pattern = rf"\b{re.escape(keyword)}\b"
-            if re.search(pattern, text):
+            if keyword.isidentifier():
+                found = keyword in words
+            else:
+                # Keywords with symbols (e.g. '=>') still need a regex search
+                found = _keyword_re(keyword).search(text) is not None
+
+            if found:
                 keyword_count += 1
                 if keyword_count >= 2:  # At least 2 keywords
                     return True
 
         return False
 
-    def extract_all_blocks(self, raw_text: str) -> List[Dict[str, str]]:
+    def extract_all_blocks(
+        self, raw_text: str, detect_language: bool = False
+    ) -> List[Dict[str, str]]:
         """
         Extract all code blocks from text.
 
@@ -366,6 +606,8 @@ class CodeBlockExtractor(ContentExtractor):
 
         Args:
             raw_text: Raw text that may contain multiple code blocks
+            detect_language: If True, run detect_language() on blocks whose fence
+                            has no language identifier. Default is False.
 
         Returns:
             List of dictionaries with 'language' and 'code' keys
@@ -373,22 +615,56 @@ class CodeBlockExtractor(ContentExtractor):
         Raises:
             TypeError: If input is not a string
         """
+        return list(self.iter_blocks(raw_text, detect_language))
+
+    def iter_blocks(
+        self, raw_text: str, detect_language: bool = False
+    ) -> Iterator[Dict[str, str]]:
+        """
+        Iterate over the code blocks in text, one block at a time.
+
+        Like extract_all_blocks(), but blocks are found lazily, so callers that
+        stop early (e.g. after the first block) skip scanning the rest of the text.
+
+        Args:
+            raw_text: Raw text that may contain multiple code blocks
+            detect_language: If True, run detect_language() on blocks whose fence
+                            has no language identifier. Default is False.
+
+        Returns:
+            Iterator of dictionaries with 'language' and 'code' keys
+
+        Raises:
+            TypeError: If input is not a string
+        """
+        # Validate eagerly, before the generator is first advanced
         if not isinstance(raw_text, str):
             raise TypeError(f"Expected string input, got {type(raw_text).__name__}")
 
-        blocks = []
+        return self._iter_blocks(raw_text, detect_language)
+
+    def _iter_blocks(self, raw_text: str, detect_language: bool) -> Iterator[Dict[str, str]]:
+        """
+        Generate metadata for each fenced code block.
+
+        Args:
+            raw_text: Raw text that may contain multiple code blocks
+            detect_language: Whether to detect the language of unlabeled blocks
 
-        # Pattern to find all fenced code blocks with language
-        pattern = r"```([\w+-]*)\s*\n(.*?)```"
-        matches = re.finditer(pattern, raw_text, re.DOTALL)
+        Yields:
+            Dictionaries with 'language' and 'code' keys
+        """
+        if "```" not in raw_text:
+            return
 
-        for match in matches:
-            language = match.group(1).strip() or "unknown"
+        # Find all fenced code blocks with language
+        for match in _ALL_FENCES_RE.finditer(raw_text):
+            language = match.group(1).strip()
             code = match.group(2).strip()
             if code:
-                blocks.append({"language": language, "code": code})
-
-        return blocks
+                if not language and detect_language:
+                    language = self.detect_language(code) or ""
+                yield {"language": language or "unknown", "code": code}
 
     def get_supported_languages(self) -> Set[str]:
         """
@@ -412,24 +688,8 @@ class CodeBlockExtractor(ContentExtractor):
         if not code:
             return None
 
-        # Count keyword matches for each language
-        language_scores = {}
-
-        for language, keywords in self.LANGUAGE_KEYWORDS.items():
-            score = 0
-            for keyword in keywords:
-                pattern = rf"\b{re.escape(keyword)}\b"
-                matches = re.findall(pattern, code)
-                score += len(matches)
-
-            if score > 0:
-                language_scores[language] = score
-
-        if not language_scores:
-            return None
-
-        # Return language with highest score
-        detected = max(language_scores.items(), key=lambda x: x[1])
-
-        # Only return if score is meaningful (at least 2 keywords)
-        return detected[0] if detected[1] >= 2 else None
+        # Freeze the keyword table so it can be part of the cache key
+        language_keywords = tuple(
+            (language, frozenset(keywords)) for language, keywords in self.LANGUAGE_KEYWORDS.items()
+        )
+        return _detect_language(code, language_keywords)
@@ -1,16 +1,173 @@
 """HTML content extraction strategy with robust error handling."""
 
+import importlib.util
 import re
-from typing import List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
-try:
-    from lxml import etree, html as lxml_html
+from llm_content_extractor.base import ContentExtractor
 
-    LXML_AVAILABLE = True
-except ImportError:
-    LXML_AVAILABLE = False
+LXML_AVAILABLE = importlib.util.find_spec("lxml") is not None
 
-from llm_content_extractor.base import ContentExtractor
+# lxml.etree and lxml.html, imported on first use to keep package import fast
+_etree: Any = None
+_lxml_html: Any = None
+
+
+def _load_lxml() -> Tuple[Any, Any]:
+    """
+    Import lxml.etree and lxml.html on first use.
+
+    Returns:
+        Tuple of the lxml.etree and lxml.html modules
+    """
+    global _etree, _lxml_html
+    if _lxml_html is None:
+        from lxml import etree, html as lxml_html
+
+        _etree, _lxml_html = etree, lxml_html
+    return _etree, _lxml_html
+
+
+def _lower_keeping_offsets(text: str) -> str:
+    """
+    Lowercase text so that offsets into the result are valid in the original.
+
+    Args:
+        text: Text to lowercase
+
+    Returns:
+        Lowercased text with the same length as text
+    """
+    lowered = text.lower()
+    if len(lowered) != len(text):
+        # A few characters (e.g. 'İ') lowercase to two; keep only the first
+        lowered = "".join(char.lower()[0] for char in text)
+    return lowered
+
+
+# Document and container patterns are matched case-sensitively against the
+# lowercased text (see _lower_keeping_offsets); the original is sliced at the
+# match offsets. A document runs from its opening to the next </html> (see
+# _iter_document_spans).
+_DOCTYPE_HTML_RE = re.compile(r'<!doctype\s+html')
+_HTML_ROOT_RE = re.compile(r'<html[^>]*>')
+
+# Common HTML container elements
+_CONTAINER_TAGS = (
+    "body",
+    "div",
+    "section",
+    "article",
+    "main",
+    "header",
+    "footer",
+    "nav",
+    "aside",
+)
+# Opening tag of any container element; the element runs to the next
+# closing tag of the same name (see _iter_tag_spans)
+_CONTAINER_OPENING_TAG_RE = re.compile(rf'<({"|".join(_CONTAINER_TAGS)})')
+
+# Opening tag name; paired tags are matched by _iter_tag_spans
+_OPENING_TAG_NAME_RE = re.compile(r'<([a-zA-Z][\w\-]*)')
+
+# Opening tags counted by the _looks_like_html heuristic; each counts when
+# a '>' follows it somewhere later in the text
+_HTML_INDICATOR_TAGS = ("<html", "<head", "<body", "<div", "<p", "<span", "<a", "<img")
+
+# Closing tag, also counted by the _looks_like_html heuristic
+_CLOSING_TAG_RE = re.compile(r'</[a-zA-Z][\w\-]*>')
+
+
+def _iter_tag_spans(
+    text: str, opening_tag_re: "re.Pattern[str]", shorter_names: bool
+) -> Iterator[Tuple[int, int]]:
+    """
+    Find elements closed by the same tag name, without lazy regex rescans.
+
+    Yields the same non-overlapping spans as finditer over
+    opening_tag_re + '[^>]*>.*?</\\1>', but looks for closing tags with
+    str.find and remembers the results. A lazy regex rescans to the end of
+    the text for every unclosed tag, which is quadratic.
+
+    Args:
+        text: Text to search
+        opening_tag_re: Pattern matching '<' and the tag name as group 1
+        shorter_names: Whether to fall back to shorter prefixes of the tag
+            name when it has no closing tag, as a '[^>]*' after a
+            variable-length name pattern would
+
+    Yields:
+        (start, end) offsets of each element
+    """
+    # Next known occurrence of each closing tag; -1 if it does not occur
+    # again. Search offsets only grow, so a cached position stays valid
+    # until the search passes it.
+    next_closing: Dict[str, int] = {}
+    pos = 0
+
+    while True:
+        match = opening_tag_re.search(text, pos)
+        if match is None:
+            return
+
+        start = match.start()
+        tag_end = text.find(">", start)
+        if tag_end == -1:
+            return
+
+        name = match.group(1)
+        end = -1
+        for length in range(len(name), 0 if shorter_names else len(name) - 1, -1):
+            closing_tag = f"</{name[:length]}>"
+            found = next_closing.get(closing_tag)
+            if found is None or -1 < found <= tag_end:
+                found = text.find(closing_tag, tag_end + 1)
+                next_closing[closing_tag] = found
+            if found != -1:
+                end = found + len(closing_tag)
+                break
+
+        if end == -1:
+            pos = start + 1
+        else:
+            yield start, end
+            pos = end
+
+
+def _iter_document_spans(lowered: str, opening_re: "re.Pattern[str]") -> Iterator[Tuple[int, int]]:
+    """
+    Find HTML documents running from an opening to the next </html>.
+
+    Yields the same non-overlapping spans as finditer over
+    opening_re + '.*?</html>', but finds </html> with str.find and stops at
+    the first opening left unclosed, since every later opening is unclosed
+    too. A lazy regex rescans to the end of the text for each of them, which
+    is quadratic.
+
+    Args:
+        lowered: Lowercased text to search
+        opening_re: Pattern matching the start of a document
+
+    Yields:
+        (start, end) offsets of each document
+    """
+    # No document ends after the last </html>; searching up to it keeps
+    # openings that follow it from being scanned at all
+    endpos = lowered.rfind("</html>") + len("</html>")
+    pos = 0
+
+    while True:
+        match = opening_re.search(lowered, pos, endpos)
+        if match is None:
+            return
+
+        closing = lowered.find("</html>", match.end(), endpos)
+        if closing == -1:
+            return
+
+        pos = closing + len("</html>")
+        yield match.start(), pos
 
 
 class HTMLExtractor(ContentExtractor):
@@ -92,6 +249,8 @@ class HTMLExtractor(ContentExtractor):
         if not LXML_AVAILABLE:
             return
 
+        etree, lxml_html = _load_lxml()
+
         try:
             # Parse HTML - lxml is lenient by default
             lxml_html.fromstring(html_text)
@@ -113,6 +272,8 @@ class HTMLExtractor(ContentExtractor):
         if not LXML_AVAILABLE:
             return html_text
 
+        etree, lxml_html = _load_lxml()
+
         try:
             # Parse HTML
             tree = lxml_html.fromstring(html_text)
@@ -150,18 +311,24 @@ class HTMLExtractor(ContentExtractor):
         if not text:
             return ""
 
+        # Cheap literal checks let us skip regex passes that cannot match.
+        lowered = _lower_keeping_offsets(text)
+        has_closing_html = "</html>" in lowered
+
         # Strategy 1: Complete HTML document with DOCTYPE
-        doctype_html = self._extract_doctype_html(text)
-        if doctype_html:
-            return doctype_html
+        if has_closing_html and "<!doctype" in lowered:
+            doctype_html = self._extract_doctype_html(text, lowered)
+            if doctype_html:
+                return doctype_html
 
         # Strategy 2: HTML with <html> root
-        html_with_root = self._extract_html_with_root(text)
-        if html_with_root:
-            return html_with_root
+        if has_closing_html and "<html" in lowered:
+            html_with_root = self._extract_html_with_root(text, lowered)
+            if html_with_root:
+                return html_with_root
 
         # Strategy 3: HTML fragments with common structures
-        html_fragment = self._extract_html_fragment(text)
+        html_fragment = self._extract_html_fragment(text, lowered)
         if html_fragment:
             return html_fragment
 
@@ -171,96 +338,96 @@ class HTMLExtractor(ContentExtractor):
 
         return ""
 
-    def _extract_doctype_html(self, text: str) -> str:
+    def _extract_doctype_html(self, text: str, lowered: Optional[str] = None) -> str:
         """
         Extract complete HTML document with DOCTYPE.
 
         Args:
             text: Text that may contain HTML document
+            lowered: Lowercased text, if already computed by the caller
 
         Returns:
             Extracted HTML or empty string
         """
-        # Pattern for DOCTYPE followed by HTML
-        pattern = r'<!DOCTYPE\s+html.*?</html>'
-        matches = re.findall(pattern, text, re.DOTALL | re.IGNORECASE)
+        if lowered is None:
+            lowered = _lower_keeping_offsets(text)
 
-        if matches:
-            return max(matches, key=len).strip()
+        # Track the longest match by offsets only
+        best_start = best_end = 0
+        for start, end in _iter_document_spans(lowered, _DOCTYPE_HTML_RE):
+            if end - start > best_end - best_start:
+                best_start, best_end = start, end
 
-        return ""
+        return text[best_start:best_end].strip()
 
-    def _extract_html_with_root(self, text: str) -> str:
+    def _extract_html_with_root(self, text: str, lowered: Optional[str] = None) -> str:
         """
         Extract HTML with <html> root element.
 
         Args:
             text: Text that may contain HTML with root
+            lowered: Lowercased text, if already computed by the caller
 
         Returns:
             Extracted HTML or empty string
         """
-        # Pattern for <html> to </html>
-        pattern = r'<html[^>]*>.*?</html>'
-        matches = re.findall(pattern, text, re.DOTALL | re.IGNORECASE)
+        if lowered is None:
+            lowered = _lower_keeping_offsets(text)
 
-        if matches:
-            return max(matches, key=len).strip()
+        # Track the longest match by offsets only
+        best_start = best_end = 0
+        for start, end in _iter_document_spans(lowered, _HTML_ROOT_RE):
+            if end - start > best_end - best_start:
+                best_start, best_end = start, end
 
-        return ""
+        return text[best_start:best_end].strip()
 
-    def _extract_html_fragment(self, text: str) -> str:
+    def _extract_html_fragment(self, text: str, lowered: Optional[str] = None) -> str:
         """
         Extract HTML fragment with common root elements.
 
         Args:
             text: Text that may contain HTML fragment
+            lowered: Lowercased text, if already computed by the caller
 
         Returns:
             Extracted HTML or empty string
         """
-        # Common HTML container elements
-        container_tags = [
-            "body",
-            "div",
-            "section",
-            "article",
-            "main",
-            "header",
-            "footer",
-            "nav",
-            "aside",
-        ]
-
-        best_match = ""
-        max_length = 0
-
-        for tag in container_tags:
-            pattern = rf'<{tag}[^>]*>.*?</{tag}>'
-            matches = re.findall(pattern, text, re.DOTALL | re.IGNORECASE)
-
-            for match in matches:
-                if len(match) > max_length:
-                    max_length = len(match)
-                    best_match = match
-
-        if best_match:
-            return best_match.strip()
+        if lowered is None:
+            lowered = _lower_keeping_offsets(text)
 
-        # Try any paired tags
-        pattern = r'<([a-zA-Z][\w\-]*)[^>]*>.*?</\1>'
-        matches = re.findall(pattern, text, re.DOTALL)
+        # Track the longest container match by offsets only
+        best_start = best_end = 0
+
+        for start, end in _iter_tag_spans(lowered, _CONTAINER_OPENING_TAG_RE, shorter_names=False):
+            if end - start > best_end - best_start:
+                best_start, best_end = start, end
+
+        if best_end:
+            return text[best_start:best_end].strip()
 
-        if matches:
-            # Reconstruct the full match
-            first_tag = matches[0]
-            tag_pattern = rf'<{re.escape(first_tag)}[^>]*>.*?</{re.escape(first_tag)}>'
-            match = re.search(tag_pattern, text, re.DOTALL)
-            if match:
-                return match.group(0).strip()
+        # Try any paired tags
+        for start, end in self._iter_paired_tags(text):
+            return text[start:end].strip()
 
         return ""
 
+    def _iter_paired_tags(self, text: str) -> Iterator[Tuple[int, int]]:
+        """
+        Find paired tags (an opening tag, content, and the matching closing tag).
+
+        Yields the same non-overlapping spans as finditer over
+        '<([a-zA-Z][\\w\\-]*)[^>]*>.*?</\\1>' without its quadratic
+        rescans of unclosed tags.
+
+        Args:
+            text: Text to search
+
+        Yields:
+            (start, end) offsets of each paired tag
+        """
+        return _iter_tag_spans(text, _OPENING_TAG_NAME_RE, shorter_names=True)
+
     def _looks_like_html(self, text: str) -> bool:
         """
         Heuristic check if text looks like HTML.
@@ -274,32 +441,28 @@ class HTMLExtractor(ContentExtractor):
         if not text:
             return False
 
-        text = text.strip()
+        lowered = text.strip().lower()
 
         # Check for DOCTYPE
-        if text.lower().startswith("<!doctype html"):
+        if lowered.startswith("<!doctype html"):
             return True
 
         # Must start with < and contain closing >
-        if not (text.startswith("<") and ">" in text):
+        last_close = lowered.rfind(">")
+        if not lowered.startswith("<") or last_close == -1:
             return False
 
-        # Check for common HTML patterns
-        html_patterns = [
-            r'<html[^>]*>',
-            r'<head[^>]*>',
-            r'<body[^>]*>',
-            r'<div[^>]*>',
-            r'<p[^>]*>',
-            r'<span[^>]*>',
-            r'<a[^>]*>',
-            r'<img[^>]*>',
-            r'</[a-zA-Z][\w\-]*>',  # Closing tag
-        ]
-
-        match_count = sum(
-            1 for pattern in html_patterns if re.search(pattern, text, re.IGNORECASE)
-        )
+        # Check for common HTML patterns with substring searches, stopping
+        # as soon as two are found
+        match_count = 0
+        for opening_tag in _HTML_INDICATOR_TAGS:
+            if lowered.find(opening_tag, 0, last_close) != -1:
+                match_count += 1
+                if match_count >= 2:
+                    return True
+
+        if _CLOSING_TAG_RE.search(lowered):
+            match_count += 1
 
         # If we find multiple HTML patterns, it's likely HTML
         return match_count >= 2
@@ -318,6 +481,8 @@ class HTMLExtractor(ContentExtractor):
             # Without lxml, use heuristic
             return self._looks_like_html(html_text)
 
+        etree, lxml_html = _load_lxml()
+
         try:
             lxml_html.fromstring(html_text)
             return True
@@ -345,13 +510,14 @@ class HTMLExtractor(ContentExtractor):
         fragments = []
         text = self._remove_markdown_fence(raw_text, "html")
 
-        # Find all paired tags
-        pattern = r'<([a-zA-Z][\w\-]*)[^>]*>.*?</\1>'
-        matches = re.finditer(pattern, text, re.DOTALL)
-
-        for match in matches:
-            fragment = match.group(0).strip()
-            if fragment and self._looks_like_html(fragment):
+        # Find all paired tags. The closing tag already counts as one HTML
+        # indicator (see _looks_like_html), so a fragment only needs one of the
+        # indicator opening tags before its final '>'.
+        for start, end in self._iter_paired_tags(text):
+            fragment = text[start:end]
+            lowered = fragment.lower()
+            last_close = len(lowered) - 1
+            if any(lowered.find(tag, 0, last_close) != -1 for tag in _HTML_INDICATOR_TAGS):
                 fragments.append(fragment)
 
         return fragments
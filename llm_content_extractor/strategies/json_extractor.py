@@ -1,11 +1,268 @@
 """JSON content extraction strategy with robust error handling."""
 
+import functools
+import importlib.util
 import json
 import re
 from typing import Any, Dict, List, Optional, Union
 
 from llm_content_extractor.base import ContentExtractor
 
+ORJSON_AVAILABLE = importlib.util.find_spec("orjson") is not None
+FAST_JSON_REPAIR_AVAILABLE = importlib.util.find_spec("fast_json_repair") is not None
+
+# Optional modules, imported on first use to keep package import fast
+_orjson: Any = None
+_fast_json_repair: Any = None
+
+_DECODER = json.JSONDecoder()
+
+
+# JSON-like patterns, any of which makes bracketed text look like JSON
+_JSON_SHAPE_RES = [
+    re.compile(r'"[^"]*"\s*:'),  # Key-value pairs
+    re.compile(r':\s*"[^"]*"'),  # String values
+    re.compile(r':\s*[\d\-]'),  # Numeric values
+    re.compile(r':\s*(?:true|false|null)'),  # Boolean/null values
+    re.compile(r'\[.*\]'),  # Arrays
+]
+
+# Common LLM comma mistakes fixed by _fix_common_errors
+_MULTI_COMMA_RE = re.compile(r',(\s*,)+')
+_LEADING_COMMA_RE = re.compile(r'([{\[])\s*,')
+
+# Tokens of the relaxed JSON that is handed to fast-json-repair: punctuation,
+# a single- or double-quoted string (closing quote optional at the end of
+# truncated output), a literal, or a bare word (only valid as an object key)
+_RELAXED_JSON_TOKEN_RE = re.compile(
+    r'\s*(?:([{}\[\],:])'
+    r'|("[^"\\]*(?:\\.[^"\\]*)*(?:"|$)|\'[^\'\\]*(?:\\.[^\'\\]*)*(?:\'|$))'
+    r'|(-?\d+(?:\.\d+)?(?:[eE][+\-]?\d+)?|true|false|null)\b'
+    r'|([A-Za-z_$][\w$]*))'
+)
+
+# Code fence with any (or no) language identifier
+_ANY_FENCE_RE = re.compile(r"```(?:\w+)?\s*\n(.*?)```", re.DOTALL | re.IGNORECASE)
+
+
+@functools.lru_cache(maxsize=8)
+def _structural_token_re(open_char: str, close_char: str) -> "re.Pattern[str]":
+    """
+    Get the token pattern used by the balanced scanner for a bracket pair.
+
+    A token is a whole string literal (escapes included, closing quote
+    optional for unterminated strings) or a single open_char/close_char.
+    Other bracket types never reach the scanner loop.
+
+    Args:
+        open_char: Opening character
+        close_char: Closing character
+
+    Returns:
+        Compiled token pattern
+    """
+    return re.compile(
+        r'"[^"\\]*(?:\\.[^"\\]*)*"?|[' + re.escape(open_char + close_char) + "]",
+        re.DOTALL,
+    )
+
+
+@functools.lru_cache(maxsize=32)
+def _language_fence_re(language: str) -> "re.Pattern[str]":
+    """
+    Get the compiled code fence pattern for a language.
+
+    Args:
+        language: Language identifier (matched case-insensitively)
+
+    Returns:
+        Compiled pattern capturing the fenced content
+    """
+    return re.compile(rf"```{re.escape(language)}\s*\n(.*?)```", re.DOTALL | re.IGNORECASE)
+
+
+def _loads(text: str) -> Any:
+    """
+    Deserialize JSON, preferring orjson when it is installed.
+
+    orjson rejects a few inputs the standard library accepts (e.g. NaN and
+    integers wider than 64 bits), so its failures fall back to json.loads.
+
+    Args:
+        text: JSON string to parse
+
+    Returns:
+        Parsed Python object
+
+    Raises:
+        json.JSONDecodeError: If the text is not valid JSON
+    """
+    global _orjson
+    if ORJSON_AVAILABLE:
+        if _orjson is None:
+            import orjson
+
+            _orjson = orjson
+        try:
+            return _orjson.loads(text)
+        except _orjson.JSONDecodeError:
+            pass
+    return json.loads(text)
+
+
+def _remove_trailing_commas(text: str) -> str:
+    """
+    Remove commas that are followed only by whitespace and a closing brace/bracket.
+
+    Jumps between closing characters with str.find and looks back over
+    whitespace for a comma, so no regex match object is built per comma.
+
+    Args:
+        text: JSON string that may have trailing commas
+
+    Returns:
+        JSON string without trailing commas
+    """
+    parts = []
+    start = 0
+    brace = text.find("}")
+    bracket = text.find("]")
+
+    while brace != -1 or bracket != -1:
+        if bracket == -1 or (brace != -1 and brace < bracket):
+            close = brace
+            brace = text.find("}", close + 1)
+        else:
+            close = bracket
+            bracket = text.find("]", close + 1)
+
+        prev = close - 1
+        while prev >= start and text[prev].isspace():
+            prev -= 1
+
+        if prev >= start and text[prev] == ",":
+            parts.append(text[start:prev])
+            start = prev + 1
+
+    parts.append(text[start:])
+    return "".join(parts)
+
+
+def _looks_like_json_data(text: str) -> bool:
+    """
+    Check that text reads as (possibly malformed) JSON data.
+
+    Accepts what fast-json-repair is meant to fix: single quotes, unquoted
+    keys, extra commas and missing closing brackets. Rejects bracketed prose
+    such as "[step 1: gather data]" or "{yes}": a bare word is only accepted
+    as an object key followed by ':', a ':' only after an object key, and
+    array elements and object values must be strings, literals or nested
+    containers.
+
+    Args:
+        text: Text starting with '{' or '['
+
+    Returns:
+        True if the text has at least one key or value and no token out of
+        place before its top-level value ends; text cut off before the end
+        must also hold a complete "key: value" or "value," member
+    """
+    # One entry per open container: its closing character and the kind of
+    # token expected next ("key", "colon", "value" or "separator")
+    stack: List[List[str]] = []
+    seen_data = False
+    seen_member = False
+    pos = 0
+
+    while True:
+        match = _RELAXED_JSON_TOKEN_RE.match(text, pos)
+        if match is None:
+            # Only missing closing brackets (and whitespace) may remain
+            if text[pos:].strip() or not seen_member:
+                return False
+            return stack[-1][1] != "colon"
+        pos = match.end()
+        punct, string, _, word = match.groups()
+        expecting = stack[-1][1] if stack else "value"
+        # A container may close (or take a comma) unless an object key is
+        # waiting for its ':' or value
+        can_close = bool(stack) and (
+            expecting in ("key", "separator")
+            or (expecting == "value" and stack[-1][0] == "]")
+        )
+
+        if punct in ("{", "["):
+            if expecting != "value":
+                return False
+            if stack:
+                stack[-1][1] = "separator"
+            stack.append(["}", "key"] if punct == "{" else ["]", "value"])
+        elif punct in ("}", "]"):
+            if not can_close:
+                return False
+            # A missing closing bracket may be implied by an outer one
+            while stack and stack[-1][0] != punct:
+                stack.pop()
+            if not stack:
+                return False
+            stack.pop()
+            if not stack:
+                return seen_data
+            seen_member = seen_member or stack[-1][0] == "}"
+        elif punct == ",":
+            if not can_close:
+                return False
+            # Repeated and leading commas are tolerated
+            if expecting == "separator":
+                seen_member = True
+            stack[-1][1] = "key" if stack[-1][0] == "}" else "value"
+        elif punct == ":":
+            if expecting != "colon":
+                return False
+            stack[-1][1] = "value"
+        elif string is not None or word is not None:
+            if expecting == "key":
+                stack[-1][1] = "colon"
+            elif expecting == "value" and string is not None and stack:
+                seen_member = seen_member or stack[-1][0] == "}"
+                stack[-1][1] = "separator"
+            else:
+                return False
+            seen_data = True
+        else:
+            # A literal
+            if expecting != "value" or not stack:
+                return False
+            seen_member = seen_member or stack[-1][0] == "}"
+            stack[-1][1] = "separator"
+            seen_data = True
+
+
+@functools.lru_cache(maxsize=256)
+def _fix_comma_errors(json_text: str) -> str:
+    """
+    Fix trailing, repeated and leading commas in JSON.
+
+    Results are cached, so retrying the same malformed snippet is a lookup.
+
+    Args:
+        json_text: JSON string that may have comma errors
+
+    Returns:
+        JSON string with comma errors fixed
+    """
+    # Fix trailing commas before closing braces/brackets
+    # This handles cases like: {"key": "value",} or [1, 2, 3,]
+    fixed = _remove_trailing_commas(json_text)
+
+    # Fix multiple consecutive commas
+    fixed = _MULTI_COMMA_RE.sub(r',', fixed)
+
+    # Fix comma at the start of object/array (rare but possible)
+    fixed = _LEADING_COMMA_RE.sub(r'\1', fixed)
+
+    return fixed
+
 
 class JSONExtractor(ContentExtractor):
     """
@@ -32,9 +289,10 @@ class JSONExtractor(ContentExtractor):
         Strategies applied in order:
         1. Remove markdown code fences
         2. Direct JSON parsing
-        3. Extract JSON-like content between braces/brackets
-        4. Fix common LLM errors (trailing commas, etc.)
-        5. Attempt lenient parsing with whitespace normalization
+        3. Decode valid JSON embedded in surrounding text
+        4. Extract JSON-like content between braces/brackets
+        5. Fix common LLM errors (trailing commas, etc.)
+        6. Repair with fast-json-repair (if installed and not in strict mode)
 
         Args:
             raw_text: Raw string that may contain JSON
@@ -50,39 +308,54 @@ class JSONExtractor(ContentExtractor):
         if not isinstance(raw_text, str):
             raise TypeError(f"Expected string input, got {type(raw_text).__name__}")
 
-        if not raw_text or not raw_text.strip():
+        stripped = raw_text.strip()
+        if not stripped:
             raise ValueError("Cannot extract JSON from empty or whitespace-only string")
 
-        # Strategy 1: Remove markdown fences and normalize whitespace
-        text = self._remove_markdown_fence(raw_text, "json")
-        text = self._normalize_whitespace(text)
+        # Fast path: clean JSON (the common case for JSON-mode output)
+        # needs no preprocessing
+        tried_fast_path = stripped[0] in "{["
+        if tried_fast_path:
+            result = self._try_parse_json(stripped)
+            if result is not None:
+                return result
+
+        # Strategy 1: Remove markdown fences (the result is already stripped)
+        text = self._remove_markdown_fence(stripped, "json")
 
         if not text:
             raise ValueError("No content remaining after preprocessing")
 
-        # Strategy 2: Try direct parsing (fastest path for clean JSON)
-        try:
-            return self._parse_json(text)
-        except (json.JSONDecodeError, ValueError):
-            pass
+        # Strategy 2: Try direct parsing, unless the fast path already tried this text
+        if not (tried_fast_path and text == stripped):
+            result = self._try_parse_json(text)
+            if result is not None:
+                return result
+
+        # Strategy 3: Decode valid JSON embedded in surrounding text
+        embedded = self._decode_embedded(text)
+        if embedded is not None:
+            return embedded
 
-        # Strategy 3: Extract JSON-like content between braces/brackets
+        # Strategy 4: Extract JSON-like content between braces/brackets.
+        # Strategy 3 already decoded from the same brace/bracket, so content
+        # that parses as-is was either returned or rejected there
         json_text = self._extract_json_content(text)
-        if json_text:
-            # Try parsing extracted content
-            try:
-                return self._parse_json(json_text)
-            except (json.JSONDecodeError, ValueError):
-                pass
-
-            # Strategy 4: Fix common LLM errors if not in strict mode
-            if not self.strict:
-                fixed_text = self._fix_common_errors(json_text)
-                if fixed_text != json_text:  # Only try if changes were made
-                    try:
-                        return self._parse_json(fixed_text)
-                    except (json.JSONDecodeError, ValueError):
-                        pass
+
+        # Strategy 5: Fix common LLM errors if not in strict mode; the
+        # balanced content must look like JSON before it is rewritten
+        if json_text and not self.strict and self._looks_like_json(json_text):
+            fixed_text = self._fix_common_errors(json_text)
+            if fixed_text != json_text:  # Only try if changes were made
+                result = self._try_parse_json(fixed_text)
+                if result is not None:
+                    return result
+
+        # Strategy 6: Repair what the built-in fixes could not
+        if not self.strict and FAST_JSON_REPAIR_AVAILABLE:
+            repaired = self._repair_json(text)
+            if repaired is not None:
+                return repaired
 
         # All strategies failed
         raise ValueError(
@@ -104,7 +377,7 @@ class JSONExtractor(ContentExtractor):
             ValueError: If parsing fails or result is not dict/list
         """
         try:
-            result = json.loads(text)
+            result = _loads(text)
         except json.JSONDecodeError as e:
             raise ValueError(f"JSON parsing failed: {e.msg} at position {e.pos}")
 
@@ -116,18 +389,115 @@ class JSONExtractor(ContentExtractor):
 
         return result
 
-    def _normalize_whitespace(self, text: str) -> str:
+    def _try_parse_json(self, text: str) -> Optional[Union[Dict[Any, Any], List[Any]]]:
+        """
+        Parse JSON string for a strategy that moves on when parsing fails.
+
+        Unlike _parse_json, failures build no error message.
+
+        Args:
+            text: JSON string to parse
+
+        Returns:
+            Parsed JSON object, or None if the text is not a JSON object/array
+        """
+        try:
+            result = _loads(text)
+        except json.JSONDecodeError:
+            return None
+
+        if not isinstance(result, (dict, list)):
+            return None
+
+        return result
+
+    def _decode_embedded(self, text: str) -> Optional[Union[Dict[Any, Any], List[Any]]]:
+        """
+        Decode a valid JSON object or array embedded in surrounding text.
+
+        Decoding starts at the first brace/bracket and stops at the end of the
+        JSON value, so trailing prose is ignored without scanning for the
+        matching closing character first. The decoded span must also look
+        like JSON, so prose such as "Use {} as a placeholder" is not taken
+        for data.
+
+        Args:
+            text: Text that may contain JSON
+
+        Returns:
+            Parsed JSON object, or None if no valid, JSON-like value starts at
+            the first brace/bracket
+        """
+        brace_idx = text.find("{")
+        bracket_idx = text.find("[")
+
+        if brace_idx == -1 and bracket_idx == -1:
+            return None
+
+        if brace_idx == -1 or (bracket_idx != -1 and bracket_idx < brace_idx):
+            start = bracket_idx
+        else:
+            start = brace_idx
+
+        try:
+            result, end = _DECODER.raw_decode(text, start)
+        except json.JSONDecodeError:
+            return None
+
+        if not self._looks_like_json(text[start:end]):
+            return None
+
+        return result
+
+    def _repair_json(self, text: str) -> Optional[Union[Dict[Any, Any], List[Any]]]:
         """
-        Normalize whitespace while preserving JSON structure.
+        Repair malformed JSON using fast-json-repair.
+
+        Handles unquoted keys, single quotes, trailing commas and missing
+        brackets. Only the balanced span (or, if the brackets never balance,
+        the text from the first brace/bracket) is repaired, and only when it
+        reads as JSON data, so stray brackets in prose are not turned into
+        data.
 
         Args:
-            text: Text to normalize
+            text: Text that may contain malformed JSON
 
         Returns:
-            Text with normalized whitespace
+            Repaired JSON object, or None if there is nothing JSON-like to
+            repair or repair did not yield a dict/list
         """
-        # Only strip leading/trailing whitespace, preserve internal structure
-        return text.strip()
+        candidate = self._extract_json_content(text)
+        if candidate:
+            if not self._looks_like_json(candidate):
+                return None
+        else:
+            brace_idx = text.find("{")
+            bracket_idx = text.find("[")
+            if brace_idx == -1 and bracket_idx == -1:
+                return None
+            if brace_idx == -1 or (bracket_idx != -1 and bracket_idx < brace_idx):
+                candidate = text[bracket_idx:]
+            else:
+                candidate = text[brace_idx:]
+
+        if not _looks_like_json_data(candidate):
+            return None
+
+        global _fast_json_repair
+        if _fast_json_repair is None:
+            import fast_json_repair
+
+            _fast_json_repair = fast_json_repair
+
+        try:
+            result = _fast_json_repair.loads(candidate)
+        except Exception:
+            return None
+
+        if not isinstance(result, (dict, list)):
+            return None
+
+        return result
 
     def _extract_json_content(self, text: str) -> str:
         """
@@ -155,19 +525,14 @@ class JSONExtractor(ContentExtractor):
 
         # Only array found, or array comes first
         if brace_idx == -1 or (bracket_idx != -1 and bracket_idx < brace_idx):
-            json_str = self._extract_balanced(text[bracket_idx:], "[", "]")
-            if json_str and self._looks_like_json(json_str):
-                return json_str
+            return self._extract_balanced(text, "[", "]", bracket_idx)
 
         # Only object found, or object comes first
-        if bracket_idx == -1 or (brace_idx != -1 and brace_idx < bracket_idx):
-            json_str = self._extract_balanced(text[brace_idx:], "{", "}")
-            if json_str and self._looks_like_json(json_str):
-                return json_str
-
-        return ""
+        return self._extract_balanced(text, "{", "}", brace_idx)
 
-    def _extract_balanced(self, text: str, open_char: str, close_char: str) -> str:
+    def _extract_balanced(
+        self, text: str, open_char: str, close_char: str, start: int = 0
+    ) -> str:
         """
         Extract balanced content between opening and closing characters.
 
@@ -177,51 +542,28 @@ class JSONExtractor(ContentExtractor):
         - Unicode escape sequences
 
         Args:
-            text: Text starting with open_char
+            text: Text with open_char at position start
             open_char: Opening character ('{' or '[')
             close_char: Closing character ('}' or ']')
+            start: Position of open_char in text; scanning begins here so
+                callers need not slice the text first
 
         Returns:
             Balanced string or empty string if not found
         """
-        if not text or text[0] != open_char:
+        if not text.startswith(open_char, start):
             return ""
 
         depth = 0
-        in_string = False
-        escape_next = False
-        i = 0
+        step = {open_char: 1, close_char: -1}
 
-        try:
-            while i < len(text):
-                char = text[i]
-
-                if escape_next:
-                    escape_next = False
-                    i += 1
-                    continue
-
-                if char == "\\" and in_string:
-                    escape_next = True
-                    i += 1
-                    continue
-
-                if char == '"' and not in_string:
-                    in_string = True
-                elif char == '"' and in_string:
-                    in_string = False
-                elif char == open_char and not in_string:
-                    depth += 1
-                elif char == close_char and not in_string:
-                    depth -= 1
-                    if depth == 0:
-                        return text[: i + 1]
-
-                i += 1
-
-        except IndexError:
-            # Malformed input, return empty string
-            return ""
+        # String literals are consumed whole by the regex engine and step
+        # the depth by 0, so only the pair's characters outside strings
+        # move it; depth first returns to 0 at the matching close_char
+        for match in _structural_token_re(open_char, close_char).finditer(text, start):
+            depth += step.get(text[match.start()], 0)
+            if depth == 0:
+                return text[start : match.end()]
 
         # No balanced structure found
         return ""
@@ -249,16 +591,17 @@ class JSONExtractor(ContentExtractor):
         if not (text.endswith("}") or text.endswith("]")):
             return False
 
-        # Should have some JSON-like patterns
-        json_patterns = [
-            r'"[^"]*"\s*:',  # Key-value pairs
-            r':\s*"[^"]*"',  # String values
-            r':\s*[\d\-]',  # Numeric values
-            r':\s*(?:true|false|null)',  # Boolean/null values
-            r'\[.*\]',  # Arrays
-        ]
+        # Cheap substring checks for the common shapes before any regex:
+        # a '":' with another quote before it is a key-value pair, and an
+        # array on a single line matches the array pattern
+        key_end = text.find('":')
+        if key_end != -1 and (text.find('"') < key_end or text.find('":', key_end + 1) != -1):
+            return True
+        if text[0] == "[" and text[-1] == "]" and "\n" not in text:
+            return True
 
-        return any(re.search(pattern, text) for pattern in json_patterns)
+        # Should have some JSON-like patterns
+        return any(pattern.search(text) for pattern in _JSON_SHAPE_RES)
 
     def _fix_common_errors(self, json_text: str) -> str:
         """
@@ -279,17 +622,7 @@ class JSONExtractor(ContentExtractor):
         if not json_text:
             return json_text
 
-        # Fix trailing commas before closing braces/brackets
-        # This handles cases like: {"key": "value",} or [1, 2, 3,]
-        fixed = re.sub(r',(\s*[}\]])', r'\1', json_text)
-
-        # Fix multiple consecutive commas
-        fixed = re.sub(r',(\s*,)+', r',', fixed)
-
-        # Fix comma at the start of object/array (rare but possible)
-        fixed = re.sub(r'([{\[])\s*,', r'\1', fixed)
-
-        return fixed
+        return _fix_comma_errors(json_text)
 
     def _extract_from_code_fence(
         self, text: str, language: Optional[str] = None
@@ -307,18 +640,12 @@ class JSONExtractor(ContentExtractor):
         if not text:
             return None
 
-        # Pattern for code fences with optional language
-        if language:
-            patterns = [
-                rf"```{language}\s*\n(.*?)```",
-                rf"```{language.upper()}\s*\n(.*?)```",
-            ]
-        else:
-            patterns = [r"```(?:\w+)?\s*\n(.*?)```"]
+        # Pattern for code fences with optional language (case-insensitive,
+        # so one pattern covers both cases of the language identifier)
+        pattern = _language_fence_re(language) if language else _ANY_FENCE_RE
 
-        for pattern in patterns:
-            matches = re.findall(pattern, text, re.DOTALL | re.IGNORECASE)
-            if matches:
-                return matches[0].strip()
+        match = pattern.search(text)
+        if match:
+            return match.group(1).strip()
 
         return None
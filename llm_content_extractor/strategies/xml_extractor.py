@@ -1,16 +1,96 @@
 """XML content extraction strategy with robust error handling."""
 
+import functools
+import importlib.util
 import re
-from typing import Any, Optional, Union
+from typing import Any, Dict, Optional, Union
 
-try:
-    from lxml import etree
+from llm_content_extractor.base import ContentExtractor
 
-    LXML_AVAILABLE = True
-except ImportError:
-    LXML_AVAILABLE = False
+LXML_AVAILABLE = importlib.util.find_spec("lxml") is not None
 
-from llm_content_extractor.base import ContentExtractor
+# lxml.etree, imported on first use to keep package import fast
+_etree: Any = None
+
+
+def _load_etree() -> Any:
+    """
+    Import lxml.etree on first use.
+
+    Returns:
+        The lxml.etree module
+    """
+    global _etree
+    if _etree is None:
+        from lxml import etree
+
+        _etree = etree
+    return _etree
+
+
+# Shared XMLParser instances, keyed by the recover flag. lxml parsers can be
+# reused across documents (concurrent use of one parser is serialized by lxml),
+# which saves building a parser per call.
+_xml_parsers: Dict[bool, Any] = {}
+
+
+def _get_xml_parser(recover: bool) -> Any:
+    """
+    Get the shared XMLParser for strict or recovery parsing.
+
+    Entity expansion and network access are disabled on both parsers.
+
+    Args:
+        recover: Whether the parser recovers from malformed XML
+
+    Returns:
+        lxml.etree.XMLParser instance
+    """
+    parser = _xml_parsers.get(recover)
+    if parser is None:
+        parser = _load_etree().XMLParser(
+            recover=recover,
+            remove_blank_text=False,
+            resolve_entities=False,  # Security: disable entity expansion
+            no_network=True,  # Security: disable network access
+        )
+        _xml_parsers[recover] = parser
+    return parser
+
+
+@functools.lru_cache(maxsize=128)
+def _is_well_formed_xml(xml_text: str) -> bool:
+    """
+    Check XML well-formedness with lxml, caching results per input.
+
+    Args:
+        xml_text: XML string to check
+
+    Returns:
+        True if the XML parses strictly, False otherwise
+    """
+    etree = _load_etree()
+
+    try:
+        etree.fromstring(xml_text.encode("utf-8"), parser=_get_xml_parser(recover=False))
+        return True
+    except (etree.XMLSyntaxError, ValueError, TypeError):
+        return False
+
+
+# Paired element: opening tag with possible attributes, content, closing tag
+_XML_PAIRED_TAG_RE = re.compile(r'<([a-zA-Z_][\w\-\.]*)[^>]*>.*?</\1>', re.DOTALL)
+_XML_SELF_CLOSING_TAG_RE = re.compile(r'<[a-zA-Z_][\w\-\.]*[^>]*/>')
+# Either a paired or a self-closing element, for the _looks_like_xml heuristic
+_XML_ELEMENT_RE = re.compile(
+    r'<([a-zA-Z_][\w\-\.]*)[^>]*>.*?</\1>|<[a-zA-Z_][\w\-\.]*[^>]*/>', re.DOTALL
+)
+
+# Documents at least this large are validated with the chunked pull parser;
+# smaller ones are parsed in one go, which is faster but builds the full tree
+_XML_PULL_PARSE_THRESHOLD = 1024 * 1024
+# Bytes fed to the pull parser at a time during validation
+_XML_FEED_CHUNK_SIZE = 64 * 1024
 
 
 class XMLExtractor(ContentExtractor):
@@ -92,15 +172,14 @@ class XMLExtractor(ContentExtractor):
         if not LXML_AVAILABLE:
             return xml_text
 
+        etree = _load_etree()
+
+        # Encode once; the recovery parse reuses the same bytes
+        xml_bytes = xml_text.encode("utf-8")
+
         try:
             # Try strict parsing first
-            parser = etree.XMLParser(
-                recover=False,
-                remove_blank_text=False,
-                resolve_entities=False,  # Security: disable entity expansion
-                no_network=True,  # Security: disable network access
-            )
-            etree.fromstring(xml_text.encode("utf-8"), parser=parser)
+            self._check_well_formed(xml_bytes)
             return xml_text
 
         except etree.XMLSyntaxError as e:
@@ -111,13 +190,7 @@ class XMLExtractor(ContentExtractor):
 
             # Try recovery mode
             try:
-                parser = etree.XMLParser(
-                    recover=True,
-                    remove_blank_text=False,
-                    resolve_entities=False,
-                    no_network=True,
-                )
-                tree = etree.fromstring(xml_text.encode("utf-8"), parser=parser)
+                tree = etree.fromstring(xml_bytes, parser=_get_xml_parser(recover=True))
 
                 # Re-serialize the recovered tree
                 recovered = etree.tostring(
@@ -130,6 +203,66 @@ class XMLExtractor(ContentExtractor):
                     f"XML validation failed and recovery unsuccessful: {str(recover_error)}"
                 )
 
+    def _check_well_formed(self, xml_bytes: bytes) -> None:
+        """
+        Check that XML is well-formed without keeping the parsed tree.
+
+        Small documents are parsed with the shared strict parser. Large ones
+        are fed to a pull parser in chunks and each element is discarded once
+        it has been parsed, so memory stays bounded by the chunk size and
+        nesting depth instead of the document size.
+
+        Args:
+            xml_bytes: UTF-8 encoded XML
+
+        Raises:
+            etree.XMLSyntaxError: If the XML is not well-formed
+        """
+        etree = _load_etree()
+        if len(xml_bytes) < _XML_PULL_PARSE_THRESHOLD:
+            etree.fromstring(xml_bytes, parser=_get_xml_parser(recover=False))
+            return
+
+        parser = etree.XMLPullParser(
+            events=("end",),
+            recover=False,
+            remove_blank_text=False,
+            resolve_entities=False,  # Security: disable entity expansion
+            no_network=True,  # Security: disable network access
+        )
+
+        # The pull parser reports errors through the global error log, which
+        # still holds entries from earlier parses
+        etree.clear_error_log()
+
+        try:
+            for offset in range(0, len(xml_bytes), _XML_FEED_CHUNK_SIZE):
+                parser.feed(xml_bytes[offset:offset + _XML_FEED_CHUNK_SIZE])
+                for _, element in parser.read_events():
+                    element.clear()
+                    # Drop already-processed siblings as well; the root has
+                    # no parent, though top-level comments/PIs may precede it
+                    parent = element.getparent()
+                    if parent is not None:
+                        while element.getprevious() is not None:
+                            del parent[0]
+
+            parser.close()
+
+        except etree.XMLSyntaxError as e:
+            # The pull parser may only report "no element found" on close;
+            # surface the actual fatal error like etree.fromstring does
+            fatal_errors = e.error_log.filter_from_fatals()
+            if not fatal_errors:
+                raise
+            error = fatal_errors[0]
+            raise etree.XMLSyntaxError(
+                f"{error.message}, line {error.line}, column {error.column}",
+                error.type,
+                error.line,
+                error.column,
+            ) from None
+
     def _extract_xml_content(self, text: str) -> str:
         """
         Extract XML content from text using multiple strategies.
@@ -169,15 +302,45 @@ class XMLExtractor(ContentExtractor):
         Returns:
             Extracted XML or empty string
         """
-        # Pattern for XML declaration followed by content
-        pattern = r'<\?xml[^>]*\?>.*?(?=<\?xml|$)'
-        matches = re.findall(pattern, text, re.DOTALL | re.IGNORECASE)
+        # Each document runs from a complete '<?xml ...?>' declaration up to
+        # the next declaration or the end of the text (before a final newline,
+        # like '$'). Track the longest one (most complete) by offsets only.
+        text_end = len(text) - 1 if text.endswith("\n") else len(text)
+        best_start = best_end = 0
+
+        start = self._find_declaration(text, 0)
+        while start != -1:
+            close = text.find(">", start + 5)
+            if close == -1:
+                break
+
+            if close > start + 5 and text[close - 1] == "?":
+                next_start = self._find_declaration(text, close + 1)
+                end = text_end if next_start == -1 else next_start
+                if end - start > best_end - best_start:
+                    best_start, best_end = start, end
+                start = next_start
+            else:
+                # Not a complete declaration; try the next one
+                start = self._find_declaration(text, start + 1)
+
+        return text[best_start:best_end].strip()
+
+    def _find_declaration(self, text: str, pos: int) -> int:
+        """
+        Find the next '<?xml' (case-insensitive) at or after pos.
 
-        if matches:
-            # Return the longest match (most complete)
-            return max(matches, key=len).strip()
+        Args:
+            text: Text to search
+            pos: Start position
 
-        return ""
+        Returns:
+            Offset of the declaration, or -1 if there is none
+        """
+        pos = text.find("<?", pos)
+        while pos != -1 and text[pos + 2:pos + 5].lower() != "xml":
+            pos = text.find("<?", pos + 1)
+        return pos
 
     def _extract_xml_fragment(self, text: str) -> str:
         """
@@ -189,29 +352,18 @@ class XMLExtractor(ContentExtractor):
         Returns:
             Extracted XML or empty string
         """
-        # Find all potential XML root elements
-        # Pattern: opening tag with possible attributes, content, closing tag
-        pattern = r'<([a-zA-Z_][\w\-\.]*)[^>]*>.*?</\1>'
-        matches = re.findall(pattern, text, re.DOTALL)
+        # Find the first potential XML root element
+        root = _XML_PAIRED_TAG_RE.search(text)
 
-        if not matches:
+        if root is None:
             # Try self-closing tags
-            pattern = r'<[a-zA-Z_][\w\-\.]*[^>]*/>'
-            if re.search(pattern, text):
-                match = re.search(pattern, text)
-                return match.group(0) if match else ""
-            return ""
+            match = _XML_SELF_CLOSING_TAG_RE.search(text)
+            return match.group(0) if match else ""
 
-        # Find the complete XML for the first root element
-        # This is a simplified approach; for complex cases, use proper parsing
-        first_tag = matches[0]
-        tag_pattern = rf'<{re.escape(first_tag)}[^>]*>.*?</{re.escape(first_tag)}>'
-        match = re.search(tag_pattern, text, re.DOTALL)
-
-        if match:
-            return match.group(0).strip()
-
-        return ""
+        # The first paired match is already the complete XML for the first
+        # root element; this is a simplified approach, for complex cases use
+        # proper parsing
+        return root.group(0).strip()
 
     def _looks_like_xml(self, text: str) -> bool:
         """
@@ -237,11 +389,7 @@ class XMLExtractor(ContentExtractor):
             return False
 
         # Check for at least one complete tag
-        tag_pattern = r'<([a-zA-Z_][\w\-\.]*)[^>]*>.*?</\1>|<[a-zA-Z_][\w\-\.]*[^>]*/>'
-        if re.search(tag_pattern, text, re.DOTALL):
-            return True
-
-        return False
+        return _XML_ELEMENT_RE.search(text) is not None
 
     def is_valid_xml(self, xml_text: str) -> bool:
         """
@@ -257,13 +405,4 @@ class XMLExtractor(ContentExtractor):
             # Without lxml, use heuristic
             return self._looks_like_xml(xml_text)
 
-        try:
-            parser = etree.XMLParser(
-                recover=False,
-                resolve_entities=False,
-                no_network=True,
-            )
-            etree.fromstring(xml_text.encode("utf-8"), parser=parser)
-            return True
-        except (etree.XMLSyntaxError, ValueError, TypeError):
-            return False
+        return _is_well_formed_xml(xml_text)
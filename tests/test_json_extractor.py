@@ -3,6 +3,7 @@
 import pytest
 
 from llm_content_extractor import extract, ContentType, JSONExtractor
+from llm_content_extractor.strategies import json_extractor
 
 
 class TestJSONExtractor:
@@ -125,3 +126,102 @@ class TestJSONExtractor:
         custom_extractor = JSONExtractor()
         result = extract('{"custom": true}', ContentType.JSON, extractor=custom_extractor)
         assert result == {"custom": True}
+
+    def test_extract_json_with_values_only_stdlib_accepts(self) -> None:
+        """Test that NaN and very large integers still parse."""
+        result = extract('{"ratio": NaN, "big": 123456789012345678901234567890}', ContentType.JSON)
+        assert result["ratio"] != result["ratio"]
+        assert result["big"] == 123456789012345678901234567890
+
+    def test_extract_json_repairs_unquoted_keys(self) -> None:
+        """Test repairing JSON with unquoted keys and single quotes."""
+        pytest.importorskip("fast_json_repair")
+        raw_text = "Result: {name: 'Frank', tags: ['a', 'b',]}"
+        result = extract(raw_text, ContentType.JSON)
+        assert result == {"name": "Frank", "tags": ["a", "b"]}
+
+    def test_prose_with_stray_brackets_raises_error(self) -> None:
+        """Test that brackets in prose are not repaired into data."""
+        raw_texts = [
+            "hello {",
+            "The answer is {yes}",
+            "Note: [see docs]",
+            "no json, but a set {1, 2, 3}",
+            "Plan [step 1: gather data]",
+            "See reference [Smith, 2020: p. 4] for details",
+            "TODO [owner: alice]",
+            "I could not finish the list [items: pending",
+        ]
+        for raw_text in raw_texts:
+            with pytest.raises(ValueError, match="Could not extract valid JSON"):
+                extract(raw_text, ContentType.JSON)
+
+    def test_extract_json_repairs_missing_bracket(self) -> None:
+        """Test repairing JSON whose closing brace is missing."""
+        pytest.importorskip("fast_json_repair")
+        result = extract('Result: {"a": [1, 2]', ContentType.JSON)
+        assert result == {"a": [1, 2]}
+
+    def test_strict_mode_does_not_repair(self) -> None:
+        """Test that strict mode rejects JSON that needs repair."""
+        with pytest.raises(ValueError, match="Could not extract valid JSON"):
+            JSONExtractor(strict=True).extract('{"items": [1, 2, 3,],}')
+
+    def test_extract_json_followed_by_braces_in_text(self) -> None:
+        """Test extracting embedded JSON when trailing text has braces."""
+        raw_text = 'Output: {"a": {"b": "}"}} and then {not json} text'
+        result = extract(raw_text, ContentType.JSON)
+        assert result == {"a": {"b": "}"}}
+
+    def test_extract_json_fixes_commas_without_repair(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test the built-in trailing, repeated and leading comma fixes."""
+        monkeypatch.setattr(json_extractor, "FAST_JSON_REPAIR_AVAILABLE", False)
+        extractor = JSONExtractor()
+        assert extractor.extract('{"a": 1, "b": [1, 2,\n],}') == {"a": 1, "b": [1, 2]}
+        assert extractor.extract('Data: {"a": 1,, "b": 2} end') == {"a": 1, "b": 2}
+        assert extractor.extract('[, 1, 2]') == [1, 2]
+        assert extractor.extract('{ ,"a": [ , 1]}') == {"a": [1]}
+
+    def test_extract_json_removes_nested_trailing_commas(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test removing trailing commas at every nesting level without repair."""
+        monkeypatch.setattr(json_extractor, "FAST_JSON_REPAIR_AVAILABLE", False)
+        extractor = JSONExtractor()
+        assert extractor.extract('{"a": 1,}') == {"a": 1}
+        assert extractor.extract('{"a": [1,], "b": {"c": 2,},}') == {"a": [1], "b": {"c": 2}}
+        assert extractor.extract('{"a": [1, 2 ,\n ],\n}') == {"a": [1, 2]}
+        assert extractor.extract('{"a": 1}') == {"a": 1}
+
+    def test_extract_json_from_single_line_shapes(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test fixing embedded key-value objects and single-line arrays in prose."""
+        monkeypatch.setattr(json_extractor, "FAST_JSON_REPAIR_AVAILABLE", False)
+        extractor = JSONExtractor()
+        assert extractor.extract('Data: {"a": 1,} end') == {"a": 1}
+        assert extractor.extract('Tags: [1, 2,] end') == [1, 2]
+        with pytest.raises(ValueError, match="Could not extract valid JSON"):
+            extractor.extract('Odd: {":}')
+
+    def test_repeated_malformed_json_gives_same_result(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that extracting the same malformed snippet twice gives identical results."""
+        monkeypatch.setattr(json_extractor, "FAST_JSON_REPAIR_AVAILABLE", False)
+        extractor = JSONExtractor()
+        raw_text = 'Result: {"cache": [1, 2,],, "hit": true,}'
+        first = extractor.extract(raw_text)
+        second = extractor.extract(raw_text)
+        assert first == second == {"cache": [1, 2], "hit": True}
+
+    def test_empty_braces_in_prose_raise_error(self) -> None:
+        """Test that an empty object or multi-line array in prose is not taken for data."""
+        for strict in (False, True):
+            extractor = JSONExtractor(strict=strict)
+            with pytest.raises(ValueError, match="Could not extract valid JSON"):
+                extractor.extract('Use {} as a placeholder')
+            with pytest.raises(ValueError, match="Could not extract valid JSON"):
+                extractor.extract('Values: [1,\n2] here')
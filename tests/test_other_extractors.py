@@ -2,7 +2,15 @@
 
 import pytest
 
-from llm_content_extractor import extract, ContentType
+from llm_content_extractor import (
+    extract,
+    extract_batch,
+    ContentType,
+    CodeBlockExtractor,
+    HTMLExtractor,
+    XMLExtractor,
+)
+from llm_content_extractor.extractor import register_extractor
 
 
 class TestXMLExtractor:
@@ -27,6 +35,12 @@ class TestXMLExtractor:
         assert '<?xml version="1.0"?>' in result
         assert '<root><item>Test</item></root>' in result
 
+    def test_extract_longest_declared_xml_document(self) -> None:
+        """Test that the longest document among several declarations is extracted."""
+        raw_text = '<?xml version="1.0"?><a/>\n<?XML version="1.0"?><root><b>x</b></root>\n'
+        result = XMLExtractor()._extract_with_declaration(raw_text)
+        assert result == '<?XML version="1.0"?><root><b>x</b></root>'
+
     def test_extract_xml_embedded_in_text(self) -> None:
         """Test extracting XML from surrounding text."""
         raw_text = 'Here is the XML: <root><data>value</data></root> - done!'
@@ -39,6 +53,45 @@ class TestXMLExtractor:
         with pytest.raises(ValueError, match="Could not extract valid XML"):
             extract(raw_text, ContentType.XML)
 
+    def test_malformed_xml_without_recovery_raises_error(self) -> None:
+        """Test that malformed XML reports the syntax error when recovery is off."""
+        extractor = XMLExtractor(recover=False)
+        with pytest.raises(ValueError, match="Invalid XML syntax: Opening and ending tag mismatch"):
+            extractor.extract('<root><item>x</root>')
+
+    def test_extract_xml_with_top_level_pi_and_comment(self) -> None:
+        """Test validating XML with a processing instruction or comment before the root."""
+        raw_text = '<?xml version="1.0"?>\n<?xml-stylesheet href="s.xsl"?>\n<root><a>1</a></root>'
+        result = extract(raw_text, ContentType.XML)
+        assert result == '<?xml-stylesheet href="s.xsl"?>\n<root><a>1</a></root>'
+
+        raw_text = '<?xml version="1.0"?><!-- c --><root/>'
+        assert extract(raw_text, ContentType.XML) == raw_text
+
+    def test_malformed_xml_reports_first_error(self) -> None:
+        """Test that the first fatal parser error is reported."""
+        extractor = XMLExtractor(recover=False)
+        with pytest.raises(ValueError, match="AttValue: \" or ' expected"):
+            extractor.extract('<root attr=1/>')
+
+    def test_is_valid_xml_repeated(self) -> None:
+        """Test that repeated validity checks give consistent results."""
+        extractor = XMLExtractor()
+        for _ in range(2):
+            assert extractor.is_valid_xml('<root><item>x</item></root>')
+            assert not extractor.is_valid_xml('<root><item>x</root>')
+
+    def test_extract_large_xml(self) -> None:
+        """Test validating XML large enough to go through the chunked pull parser."""
+        items = '<item>value</item>' * 70000
+        raw_text = '<?xml-stylesheet href="s.xsl"?><root>' + items + '</root>'
+        result = extract(raw_text, ContentType.XML)
+        assert result == raw_text
+
+        extractor = XMLExtractor(recover=False)
+        with pytest.raises(ValueError, match="AttValue: \" or ' expected"):
+            extractor.extract('<root>' + items + '<bad attr=1/></root>')
+
 
 class TestHTMLExtractor:
     """Test cases for HTMLExtractor."""
@@ -81,6 +134,46 @@ class TestHTMLExtractor:
         with pytest.raises(ValueError, match="Could not extract valid HTML"):
             extract(raw_text, ContentType.HTML)
 
+    def test_extract_uppercase_html_fragment(self) -> None:
+        """Test extracting HTML fragment with uppercase tags."""
+        raw_text = 'Result: <SECTION><P>Hi</P></SECTION> done'
+        result = extract(raw_text, ContentType.HTML)
+        assert result == '<SECTION><P>Hi</P></SECTION>'
+
+    def test_extract_html_after_multichar_lowercase(self) -> None:
+        """Test that text whose lowercase is longer keeps the right offsets."""
+        raw_text = 'İİ Result: <DIV>Hi</DIV> done'
+        result = extract(raw_text, ContentType.HTML)
+        assert result == '<DIV>Hi</DIV>'
+
+    def test_extract_longest_container_fragment(self) -> None:
+        """Test that the longest container element is extracted."""
+        raw_text = 'A <div>short</div> and <section><div>a</div><div>b</div></section>'
+        result = extract(raw_text, ContentType.HTML)
+        assert result == '<section><div>a</div><div>b</div></section>'
+
+    def test_extract_paired_tag_after_unclosed_tags(self) -> None:
+        """Test that unclosed tags are skipped when finding a paired tag."""
+        raw_text = 'Line<br> and <img src="x"> then <em>done</em>' + ' <b>' * 2000
+        result = extract(raw_text, ContentType.HTML)
+        assert result == '<em>done</em>'
+
+    def test_extract_container_after_unclosed_containers(self) -> None:
+        """Test that unclosed container tags are skipped when finding a container."""
+        raw_text = 'Intro <div>closed</div>' + ' <div>x' * 20000
+        result = extract(raw_text, ContentType.HTML)
+        assert result == '<div>closed</div>'
+
+    def test_extract_document_before_unclosed_documents(self) -> None:
+        """Test that unclosed <html> openings after the last </html> are skipped."""
+        raw_text = 'Page: <html><p>ok</p></html> ' + '<html>x ' * 20000
+        result = extract(raw_text, ContentType.HTML)
+        assert result == '<html><p>ok</p></html>'
+
+        raw_text = '<!DOCTYPE html><html>ok</html> ' + '<!doctype html><html>x ' * 20000
+        result = extract(raw_text, ContentType.HTML)
+        assert result == '<!DOCTYPE html><html>ok</html>'
+
 
 class TestCodeBlockExtractor:
     """Test cases for CodeBlockExtractor."""
@@ -134,6 +227,41 @@ const obj = {key: "value"};
         assert 'const arr = [1, 2, 3];' in result
         assert 'const obj = {key: "value"};' in result
 
+    def test_extract_code_language_fence_preference(self) -> None:
+        """Test that a matching language fence wins, case-insensitively."""
+        raw_text = '```bash\nls -la\n```\n\n```PYTHON\nprint(1)\n```'
+        assert extract(raw_text, ContentType.CODE, language='python') == 'print(1)'
+        assert extract(raw_text, ContentType.CODE, language='go') == 'ls -la'
+
+    def test_extract_all_blocks_language_detection_is_opt_in(self) -> None:
+        """Test that unlabeled blocks are only classified when requested."""
+        extractor = CodeBlockExtractor()
+        raw_text = '```\ndef f(x):\n    return x\n```\n```go\nfunc main() {}\n```'
+        assert [b["language"] for b in extractor.extract_all_blocks(raw_text)] == ["unknown", "go"]
+        blocks = extractor.extract_all_blocks(raw_text, detect_language=True)
+        assert [b["language"] for b in blocks] == ["python", "go"]
+
+    def test_iter_blocks_is_lazy(self) -> None:
+        """Test iterating code blocks one at a time."""
+        extractor = CodeBlockExtractor()
+        raw_text = '```python\nx = 1\n```\n```js\nlet y = 2;\n```'
+        blocks = extractor.iter_blocks(raw_text)
+        assert next(blocks) == {"language": "python", "code": "x = 1"}
+        assert next(blocks) == {"language": "js", "code": "let y = 2;"}
+        assert next(blocks, None) is None
+        with pytest.raises(TypeError):
+            extractor.iter_blocks(None)
+
+    def test_detect_language_respects_subclass_keywords(self) -> None:
+        """Test that cached language detection uses each class's keywords."""
+
+        class SQLExtractor(CodeBlockExtractor):
+            LANGUAGE_KEYWORDS = {"sql": {"select", "from", "where"}}
+
+        code = "select name from users where id = 1"
+        assert CodeBlockExtractor().detect_language(code) is None
+        assert SQLExtractor().detect_language(code) == "sql"
+
     def test_invalid_code_raises_error(self) -> None:
         """Test that plain text raises ValueError."""
         raw_text = "This is just plain English text without any code patterns."
@@ -159,3 +287,27 @@ class TestExtractAPI:
         """Test invalid extractor type raises TypeError."""
         with pytest.raises(TypeError, match="must be an instance of ContentExtractor"):
             extract("test", ContentType.JSON, extractor="not_an_extractor")  # type: ignore
+
+    def test_register_extractor_replaces_cached_instance(self) -> None:
+        """Test that registering an extractor takes effect after prior calls."""
+        class UpperHTMLExtractor(HTMLExtractor):
+            def extract(self, raw_text: str) -> str:
+                return super().extract(raw_text).upper()
+
+        assert extract('<p>hi</p>', ContentType.HTML) == '<p>hi</p>'
+        register_extractor(ContentType.HTML, UpperHTMLExtractor)
+        try:
+            assert extract('<p>hi</p>', ContentType.HTML) == '<P>HI</P>'
+        finally:
+            register_extractor(ContentType.HTML, HTMLExtractor)
+        assert extract('<p>hi</p>', ContentType.HTML) == '<p>hi</p>'
+
+    def test_extract_batch(self) -> None:
+        """Test extracting content from several outputs at once."""
+        raw_texts = ['{"a": 1}', '```json\n[1, 2]\n```', 'Data: {"b": true}']
+        assert extract_batch(raw_texts, "json") == [{"a": 1}, [1, 2], {"b": True}]
+
+    def test_extract_batch_code_with_language(self) -> None:
+        """Test batch extraction of code blocks for a specific language."""
+        raw_texts = ['```python\nx = 1\n```', '```js\nlet y;\n```\n```python\ny = 2\n```']
+        assert extract_batch(raw_texts, ContentType.CODE, language='python') == ['x = 1', 'y = 2']